@@ -2,12 +2,13 @@
 Configuration settings for SAR-C Backend.
 """
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Final
 from pydantic_settings import BaseSettings
-from functools import lru_cache
 
 
-class Settings(BaseSettings):
+class EnvSettings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Copernicus Marine Service
@@ -30,7 +31,28 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-@lru_cache
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable application settings, parsed once at startup."""
+    copernicus_username: str
+    copernicus_password: str
+    api_host: str
+    api_port: int
+    debug: bool
+    data_cache_dir: Path
+    cors_origins: tuple[str, ...]
+
+
+def _load() -> Settings:
+    """Parse the environment once and freeze the result."""
+    env = EnvSettings().model_dump()
+    env["cors_origins"] = tuple(env["cors_origins"])
+    return Settings(**env)
+
+
+SETTINGS: Final = _load()
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the settings loaded at startup."""
+    return SETTINGS
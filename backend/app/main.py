@@ -2,20 +2,41 @@
 SAR-C Backend - Search & Rescue with Copernicus
 Main FastAPI application entry point.
 """
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.routers import drift, data
+from app.services.copernicus import get_copernicus_client
+from app.utils.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the Copernicus session before serving requests."""
+    if settings.copernicus_username:
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, get_copernicus_client().warm_up):
+            logger.info("Copernicus session ready")
+    yield
+
+
 app = FastAPI(
     title="SAR-C API",
     description="Search & Rescue with Copernicus - Drift Prediction API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
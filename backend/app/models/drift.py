@@ -63,6 +63,7 @@ class DriftResponse(BaseModel):
     estimated_drift_distance_km: float = Field(..., description="Estimated drift distance in kilometers")
     confidence_level: float = Field(..., description="Confidence level (0-1)")
     calculation_time_seconds: float = Field(..., description="Time taken for calculation")
+    particles: Optional[dict] = Field(None, description="Final particle positions as {'lats': [...], 'lons': [...]}")
     particles_summary: dict = Field(..., description="Summary of particle distribution")
 
 
@@ -2,7 +2,11 @@
 Leeway coefficients for different object types.
 Based on international SAR manuals and drift studies.
 """
+import math
 from dataclasses import dataclass
+
+import numpy as np
+
 from app.models.drift import ObjectType
 
 
@@ -70,9 +74,42 @@ LEEWAY_COEFFICIENTS: dict[ObjectType, LeewayCoefficient] = {
 }
 
 
+# Divergence angle in radians; scaled by the divergence direction (-1, 0, 1)
+DIVERGENCE_RAD: dict[ObjectType, float] = {
+    ot: math.radians(c.divergence_angle)
+    for ot, c in LEEWAY_COEFFICIENTS.items()
+}
+
+# Mean leeway percentage used by the deterministic model
+LEEWAY_MEAN: dict[ObjectType, float] = {
+    ot: (c.leeway_percent_min + c.leeway_percent_max) / 2
+    for ot, c in LEEWAY_COEFFICIENTS.items()
+}
+
+
+# Int-indexed variants for hot paths, in ObjectType declaration order.
+# Indexing a tuple avoids hashing the enum member on every lookup.
+OBJECT_TYPE_INDEX: dict[ObjectType, int] = {ot: i for i, ot in enumerate(ObjectType)}
+
+# Kernel parameters per object type: (leeway_percent_min, leeway_percent_max,
+# divergence_angle_rad) as float32, ready to pass to the step kernels
+LEEWAY_TABLE: tuple[tuple[np.float32, np.float32, np.float32], ...] = tuple(
+    (
+        np.float32(LEEWAY_COEFFICIENTS[ot].leeway_percent_min),
+        np.float32(LEEWAY_COEFFICIENTS[ot].leeway_percent_max),
+        np.float32(DIVERGENCE_RAD[ot])
+    )
+    for ot in ObjectType
+)
+
+
+_LOOKUP = LEEWAY_COEFFICIENTS.__getitem__
+_DEFAULT_COEFF = LEEWAY_COEFFICIENTS[ObjectType.PERSON_IN_WATER_VERTICAL]
+
+
 def get_leeway_coefficient(object_type: ObjectType) -> LeewayCoefficient:
     """Get the leeway coefficient for a given object type."""
-    return LEEWAY_COEFFICIENTS.get(
-        object_type, 
-        LEEWAY_COEFFICIENTS[ObjectType.PERSON_IN_WATER_VERTICAL]
-    )
+    try:
+        return _LOOKUP(object_type)
+    except KeyError:
+        return _DEFAULT_COEFF
@@ -2,6 +2,7 @@
 Copernicus data API endpoints.
 """
 import logging
+import math
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -14,26 +15,35 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Bound once at import; both are process-wide singletons
+SETTINGS = get_settings()
+CLIENT = get_copernicus_client()
+
+
+def _check_bbox(min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> None:
+    """Validate bounding box query parameters with plain comparisons."""
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise HTTPException(status_code=422, detail="Latitude bounds must satisfy -90 <= min_lat <= max_lat <= 90")
+    if not (-180 <= min_lon <= max_lon <= 180):
+        raise HTTPException(status_code=422, detail="Longitude bounds must satisfy -180 <= min_lon <= max_lon <= 180")
+
 
 @router.get("/status")
 async def get_data_status():
     """Check Copernicus Marine Service connection status."""
-    settings = get_settings()
-    client = get_copernicus_client()
-    
     return {
-        "configured": bool(settings.copernicus_username),
-        "cache_dir": str(settings.data_cache_dir),
-        "cache_dir_exists": settings.data_cache_dir.exists()
+        "configured": bool(SETTINGS.copernicus_username),
+        "cache_dir": str(SETTINGS.data_cache_dir),
+        "cache_dir_exists": SETTINGS.data_cache_dir.exists()
     }
 
 
 @router.get("/currents")
 async def get_currents(
-    min_lat: float = Query(..., ge=-90, le=90),
-    max_lat: float = Query(..., ge=-90, le=90),
-    min_lon: float = Query(..., ge=-180, le=180),
-    max_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(...),
+    max_lat: float = Query(...),
+    min_lon: float = Query(...),
+    max_lon: float = Query(...),
     start_time: Optional[datetime] = None,
     hours: int = Query(default=24, ge=1, le=72)
 ):
@@ -42,15 +52,15 @@ async def get_currents(
     
     Returns metadata about the currents in the area.
     """
+    _check_bbox(min_lat, max_lat, min_lon, max_lon)
+    
     if start_time is None:
         start_time = datetime.utcnow()
     
     end_time = start_time + timedelta(hours=hours)
     
-    client = get_copernicus_client()
-    
     try:
-        data = client.get_currents_data(
+        data = CLIENT.get_currents_data(
             min_lat=min_lat,
             max_lat=max_lat,
             min_lon=min_lon,
@@ -84,7 +94,7 @@ async def get_currents(
             "summary": {
                 "mean_eastward_velocity_ms": round(mean_u, 4),
                 "mean_northward_velocity_ms": round(mean_v, 4),
-                "mean_speed_ms": round((mean_u**2 + mean_v**2)**0.5, 4)
+                "mean_speed_ms": round(math.hypot(mean_u, mean_v), 4)
             }
         }
         
@@ -95,10 +105,10 @@ async def get_currents(
 
 @router.get("/wind")
 async def get_wind(
-    min_lat: float = Query(..., ge=-90, le=90),
-    max_lat: float = Query(..., ge=-90, le=90),
-    min_lon: float = Query(..., ge=-180, le=180),
-    max_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(...),
+    max_lat: float = Query(...),
+    min_lon: float = Query(...),
+    max_lon: float = Query(...),
     start_time: Optional[datetime] = None,
     hours: int = Query(default=24, ge=1, le=72)
 ):
@@ -107,15 +117,15 @@ async def get_wind(
     
     Returns metadata about the wind in the area.
     """
+    _check_bbox(min_lat, max_lat, min_lon, max_lon)
+    
     if start_time is None:
         start_time = datetime.utcnow()
     
     end_time = start_time + timedelta(hours=hours)
     
-    client = get_copernicus_client()
-    
     try:
-        data = client.get_wind_data(
+        data = CLIENT.get_wind_data(
             min_lat=min_lat,
             max_lat=max_lat,
             min_lon=min_lon,
@@ -152,7 +162,7 @@ async def get_wind(
             "summary": {
                 "mean_eastward_velocity_ms": round(mean_u, 4),
                 "mean_northward_velocity_ms": round(mean_v, 4),
-                "mean_speed_ms": round((mean_u**2 + mean_v**2)**0.5, 4)
+                "mean_speed_ms": round(math.hypot(mean_u, mean_v), 4)
             }
         }
         
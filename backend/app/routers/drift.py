@@ -1,32 +1,38 @@
 """
 Drift calculation API endpoints.
 """
+import asyncio
 import logging
+import queue
+import threading
 from datetime import datetime, timedelta
+from functools import partial
+
+import orjson
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import Response, StreamingResponse
 
 from app.models.drift import DriftRequest, DriftResponse, ObjectType
 from app.models.leeway_coefficients import get_leeway_coefficient, LEEWAY_COEFFICIENTS
 from app.services.copernicus import get_copernicus_client
-from app.services.monte_carlo import MonteCarloSimulator
+from app.services.monte_carlo import MonteCarloSimulator, SimulationResult
 from app.utils.geo import create_bounding_box
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Bound once at import; the client is a process-wide singleton
+CLIENT = get_copernicus_client()
 
-@router.post("/calculate", response_model=DriftResponse)
-async def calculate_drift(request: DriftRequest):
-    """
-    Calculate the search area for a drifting object.
-    
-    This endpoint performs a Monte Carlo simulation to predict
-    where a drifting object might be after a given time period.
-    """
-    logger.info(f"Calculating drift for LKP: ({request.lkp.lat}, {request.lkp.lon})")
-    
+
+# Sentinel marking the end of a streamed simulation
+_STREAM_DONE = object()
+
+
+async def _load_environment(request: DriftRequest):
+    """Fetch currents and wind data covering the request's likely drift area."""
     # Create bounding box for data download
     # Estimate max drift based on projection hours (rough estimate: 2 km/hour max)
     estimated_max_drift_km = request.projection_hours * 2
@@ -36,40 +42,75 @@ async def calculate_drift(request: DriftRequest):
         estimated_max_drift_km + 20  # Add buffer
     )
     
-    # Get Copernicus client
-    client = get_copernicus_client()
-    
     # Time range for data
     start_time = request.incident_time
     end_time = request.incident_time + timedelta(hours=request.projection_hours)
     
-    # Try to get oceanographic data
-    currents_data = None
-    wind_data = None
-    
-    try:
-        currents_data = client.get_currents_data(
-            min_lat=bbox[0],
-            max_lat=bbox[1],
-            min_lon=bbox[2],
-            max_lon=bbox[3],
-            start_time=start_time,
-            end_time=end_time
-        )
-    except Exception as e:
-        logger.warning(f"Could not get currents data: {e}")
-    
-    try:
-        wind_data = client.get_wind_data(
-            min_lat=bbox[0],
-            max_lat=bbox[1],
-            min_lon=bbox[2],
-            max_lon=bbox[3],
-            start_time=start_time,
-            end_time=end_time
-        )
-    except Exception as e:
-        logger.warning(f"Could not get wind data: {e}")
+    # Fetch currents and wind concurrently; both calls do blocking I/O
+    loop = asyncio.get_running_loop()
+    data_kwargs = dict(
+        min_lat=bbox[0],
+        max_lat=bbox[1],
+        min_lon=bbox[2],
+        max_lon=bbox[3],
+        start_time=start_time,
+        end_time=end_time
+    )
+    currents_data, wind_data = await asyncio.gather(
+        loop.run_in_executor(None, partial(CLIENT.get_currents_data, **data_kwargs)),
+        loop.run_in_executor(None, partial(CLIENT.get_wind_data, **data_kwargs)),
+        return_exceptions=True
+    )
+    
+    if isinstance(currents_data, Exception):
+        logger.warning(f"Could not get currents data: {currents_data}")
+        currents_data = None
+    
+    if isinstance(wind_data, Exception):
+        logger.warning(f"Could not get wind data: {wind_data}")
+        wind_data = None
+    
+    return currents_data, wind_data
+
+
+def _drift_response_body(request: DriftRequest, result: SimulationResult, completed_particles: int) -> bytes:
+    """
+    Encode a (possibly partial) simulation result as a DriftResponse JSON body.
+    
+    The simulator output is trusted, so the polygons and particle arrays
+    are serialized directly instead of being re-validated by Pydantic.
+    """
+    body = {
+        "search_area": result.search_polygon,
+        "priority_zone": result.priority_polygon,
+        "estimated_drift_distance_km": result.mean_drift_km,
+        "confidence_level": 0.80,
+        "calculation_time_seconds": result.simulation_time_seconds,
+        "particles": {
+            "lats": result.final_lats,
+            "lons": result.final_lons
+        },
+        "particles_summary": {
+            "total_particles": request.num_particles,
+            "completed_particles": completed_particles,
+            "projection_hours": request.projection_hours,
+            "object_type": request.object_type.value
+        }
+    }
+    return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@router.post("/calculate", response_model=DriftResponse)
+async def calculate_drift(request: DriftRequest):
+    """
+    Calculate the search area for a drifting object.
+    
+    This endpoint performs a Monte Carlo simulation to predict
+    where a drifting object might be after a given time period.
+    """
+    logger.info(f"Calculating drift for LKP: ({request.lkp.lat}, {request.lkp.lon})")
+    
+    currents_data, wind_data = await _load_environment(request)
     
     # Run simulation
     simulator = MonteCarloSimulator(
@@ -86,20 +127,78 @@ async def calculate_drift(request: DriftRequest):
         num_particles=request.num_particles
     )
     
-    return DriftResponse(
-        search_area=result.search_polygon,
-        priority_zone=result.priority_polygon,
-        estimated_drift_distance_km=result.mean_drift_km,
-        confidence_level=0.80,
-        calculation_time_seconds=result.simulation_time_seconds,
-        particles_summary={
-            "total_particles": request.num_particles,
-            "projection_hours": request.projection_hours,
-            "object_type": request.object_type.value
-        }
+    return Response(
+        content=_drift_response_body(request, result, request.num_particles),
+        media_type="application/json"
     )
 
 
+@router.post("/calculate/stream")
+async def calculate_drift_stream(request: DriftRequest):
+    """
+    Calculate the search area, streaming partial results as server-sent events.
+    
+    The simulation runs in ten batches of particles. After each batch an
+    event carrying a DriftResponse for every particle simulated so far is
+    sent, so the UI can render the search area progressively. The last
+    event covers all particles.
+    """
+    logger.info(f"Streaming drift calculation for LKP: ({request.lkp.lat}, {request.lkp.lon})")
+    
+    currents_data, wind_data = await _load_environment(request)
+    
+    simulator = MonteCarloSimulator(
+        currents_data=currents_data,
+        wind_data=wind_data
+    )
+    
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        results: queue.Queue = queue.Queue()
+        # Set when the client goes away; the producer stops at the next batch
+        cancelled = threading.Event()
+        
+        def produce():
+            try:
+                for partial_result in simulator.run_simulation_streaming(
+                    start_lat=request.lkp.lat,
+                    start_lon=request.lkp.lon,
+                    start_time=request.incident_time,
+                    projection_hours=request.projection_hours,
+                    object_type=request.object_type,
+                    num_particles=request.num_particles
+                ):
+                    if cancelled.is_set():
+                        break
+                    results.put(partial_result)
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(_STREAM_DONE)
+        
+        loop.run_in_executor(None, produce)
+        
+        try:
+            while True:
+                item = await loop.run_in_executor(None, results.get)
+                if item is _STREAM_DONE:
+                    break
+                if isinstance(item, Exception):
+                    logger.error(f"Streaming simulation failed: {item}")
+                    yield b"event: error\ndata: " + orjson.dumps({"detail": str(item)}) + b"\n\n"
+                    break
+                
+                # The orjson body is already UTF-8; frame it without decoding
+                body = _drift_response_body(request, item, len(item.final_lats))
+                yield b"data: " + body + b"\n\n"
+        finally:
+            # Runs on normal completion and when the client disconnects
+            # (the generator is closed); either way stop the simulation
+            cancelled.set()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/object-types")
 async def get_object_types():
     """Get available object types and their leeway coefficients."""
@@ -140,9 +239,15 @@ async def preview_drift(request: DriftRequest):
         num_particles=quick_request.num_particles
     )
     
-    return {
+    # The polygon ring is an ndarray; serialize it directly, as jsonable_encoder
+    # would mangle it on the default response path
+    body = {
         "preview": True,
         "search_area": result.search_polygon,
         "estimated_drift_km": result.mean_drift_km,
         "stranded_particles": result.stranded_particle_count
     }
+    return Response(
+        content=orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
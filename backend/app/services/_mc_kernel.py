@@ -0,0 +1,158 @@
+"""
+Numba kernel for the Monte Carlo time step.
+Fuses leeway, unit conversion, position update and the land check into a
+single parallel pass over the particles.
+"""
+import math
+import threading
+
+import numpy as np
+
+from app.services.land_mask import LAND_MASK, is_land, is_land_point
+from app.services.leeway import _leeway_point, _M_PER_DEG_LAT, _SEC_PER_HOUR
+from app.utils.jit import njit, prange, NUMBA_AVAILABLE
+
+# Degrees of latitude travelled per hour at 1 m/s; float32 so the kernel
+# arithmetic stays in float32
+_DEG_LAT_PER_M_S = np.float32(_SEC_PER_HOUR / _M_PER_DEG_LAT)
+
+
+# Simulations run on several threads at once (the event loop for /calculate,
+# executor threads for streams). Numba's workqueue threading layer, the only
+# one available without TBB or OpenMP, aborts on concurrent parallel calls,
+# so callers hold this lock around step()
+STEP_LOCK = threading.Lock()
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def step(
+    lat, lon, cu, cv, wu, wv,
+    params, noise_c, noise_w, div_dir, lee_pct,
+    dt, land, out_lat, out_lon, on_land
+):
+    """
+    Advance particles by one time step.
+    
+    Particles whose new position is on land stay where they were and are
+    flagged in on_land.
+    
+    Args:
+        lat, lon: Particle positions at the start of the step
+        cu, cv, wu, wv: Current and wind velocities at the particles (m/s)
+        params: (leeway_percent_min, leeway_percent_max, divergence_angle_rad)
+        noise_c, noise_w, div_dir, lee_pct: Random inputs from draw_leeway_noise
+        dt: Time step in hours
+        land: land_mask.LAND_MASK
+        out_lat, out_lon: Receive the positions at the end of the step
+        on_land: Receives whether each particle stranded this step
+    """
+    lee_min, lee_max, div_angle_rad = params
+    mask, lat0, dlat_inv, lon0, dlon_inv = land
+    lee_range = lee_max - lee_min
+    deg_per_m_s = _DEG_LAT_PER_M_S * dt
+    for i in prange(lat.shape[0]):
+        vel_u, vel_v = _leeway_point(
+            cu[i], cv[i], wu[i], wv[i],
+            noise_c[0, i], noise_c[1, i], noise_w[0, i], noise_w[1, i],
+            lee_min + lee_range * lee_pct[i],
+            div_angle_rad * div_dir[i]
+        )
+        new_lat = lat[i] + vel_v * deg_per_m_s
+        new_lon = lon[i] + vel_u * deg_per_m_s / math.cos(math.radians(lat[i]))
+        stranded = is_land_point(mask, lat0, dlat_inv, lon0, dlon_inv, new_lat, new_lon)
+        on_land[i] = stranded
+        out_lat[i] = lat[i] if stranded else new_lat
+        out_lon[i] = lon[i] if stranded else new_lon
+
+
+# Particles per block in the NumPy step; the block's temporaries (7 float32
+# rows) stay well inside L2
+BLOCK_SIZE = 8192
+
+
+def make_work_buffers(block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """Scratch rows for step_numpy, allocated once per simulation."""
+    return np.empty((7, block_size), dtype=np.float32)
+
+
+def step_numpy(
+    lat, lon, cu, cv, wu, wv,
+    params, noise_c, noise_w, div_dir, lee_pct,
+    dt, land, out_lat, out_lon, on_land, work
+):
+    """
+    NumPy version of step for installs without numba.
+    
+    Particles are processed in blocks of work.shape[1] so the intermediate
+    arrays stay cache-resident; every ufunc writes into the preallocated
+    work rows instead of allocating temporaries.
+    
+    Args:
+        Same as step, plus:
+        work: Scratch buffer from make_work_buffers
+    """
+    lee_min, lee_max, div_angle_rad = params
+    lee_range = lee_max - lee_min
+    deg_per_m_s = _DEG_LAT_PER_M_S * dt
+    n = lat.shape[0]
+    block_size = work.shape[1]
+    
+    for start in range(0, n, block_size):
+        sl = slice(start, min(start + block_size, n))
+        vel_u, vel_v, wind_u, wind_v, speed, direction, tmp = work[:, :sl.stop - start]
+        
+        # Noisy current and wind: x * (1 + noise)
+        np.multiply(cu[sl], noise_c[0, sl], out=vel_u)
+        vel_u += cu[sl]
+        np.multiply(cv[sl], noise_c[1, sl], out=vel_v)
+        vel_v += cv[sl]
+        np.multiply(wu[sl], noise_w[0, sl], out=wind_u)
+        wind_u += wu[sl]
+        np.multiply(wv[sl], noise_w[1, sl], out=wind_v)
+        wind_v += wv[sl]
+        
+        # Leeway speed and direction
+        np.hypot(wind_u, wind_v, out=speed)
+        np.multiply(lee_pct[sl], lee_range, out=tmp)
+        tmp += lee_min
+        speed *= tmp
+        np.arctan2(wind_v, wind_u, out=direction)
+        np.multiply(div_dir[sl], div_angle_rad, out=tmp)
+        direction += tmp
+        
+        # Total velocity
+        np.cos(direction, out=tmp)
+        tmp *= speed
+        vel_u += tmp
+        np.sin(direction, out=tmp)
+        tmp *= speed
+        vel_v += tmp
+        
+        # Position update
+        np.multiply(vel_v, deg_per_m_s, out=out_lat[sl])
+        out_lat[sl] += lat[sl]
+        np.radians(lat[sl], out=tmp)
+        np.cos(tmp, out=tmp)
+        np.divide(vel_u, tmp, out=tmp)
+        tmp *= deg_per_m_s
+        np.add(lon[sl], tmp, out=out_lon[sl])
+        
+        # Particles that hit land stay at their last water position
+        stranded = is_land(out_lat[sl], out_lon[sl], land)
+        on_land[sl] = stranded
+        np.copyto(out_lat[sl], lat[sl], where=stranded)
+        np.copyto(out_lon[sl], lon[sl], where=stranded)
+
+
+# Compile (or load from cache) the kernel at import time
+if NUMBA_AVAILABLE:
+    _ones = np.ones(1, dtype=np.float32)
+    _zero = np.float32(0.0)
+    step(
+        _ones, _ones, _ones, _ones, _ones, _ones,
+        (_zero, _zero, _zero),
+        np.zeros((2, 1), dtype=np.float32), np.zeros((2, 1), dtype=np.float32),
+        np.zeros(1, dtype=np.int8), _ones,
+        np.float32(1.0), LAND_MASK,
+        np.empty(1, dtype=np.float32), np.empty(1, dtype=np.float32), np.empty(1, dtype=np.bool_)
+    )
@@ -2,7 +2,10 @@
 Copernicus Marine Service client for downloading oceanographic data.
 """
 import os
+import math
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
@@ -18,6 +21,56 @@ logger = logging.getLogger(__name__)
 CURRENTS_PRODUCT_ID = "cmems_mod_glo_phy-cur_anfc_0.083deg_PT6H-i"
 WIND_PRODUCT_ID = "cmems_obs-wind_glo_phy_nrt_l4_0.125deg_PT1H"
 
+# h5netcdf opens our small cache files noticeably faster than netCDF4
+NETCDF_ENGINE = "h5netcdf"
+
+# Size of the cache tiles in degrees; requests are assembled from whole tiles
+TILE_SIZE_DEG = 1
+
+# Concurrent tile downloads per request; each is one remote subset call
+DOWNLOAD_WORKERS = 8
+
+def _downcast(ds: xr.Dataset) -> xr.Dataset:
+    """
+    Store floating point variables as float32.
+    
+    Velocities carry ~0.001 m/s of meaningful precision, so float32 is
+    lossless for SAR use and halves disk and memory footprint.
+    """
+    ds = ds.copy()
+    for name, var in ds.data_vars.items():
+        if np.issubdtype(var.dtype, np.floating):
+            ds[name] = var.astype(np.float32)
+            ds[name].encoding = {}
+    return ds
+
+
+def _cache_encoding(ds: xr.Dataset) -> dict:
+    """
+    Build a compressed NetCDF4 encoding for the cache files.
+    
+    Tiles are small and always loaded whole, so the chunk layout is left
+    to the backend; only compression is set.
+    """
+    return {
+        name: {"zlib": True, "complevel": 3}
+        for name, var in ds.data_vars.items()
+        if var.ndim > 0
+    }
+
+
+@lru_cache(maxsize=128)
+def _open_cached(path_str: str) -> xr.Dataset:
+    """
+    Open a cached NetCDF file and load it into memory.
+    
+    Repeated requests for the same area and time (e.g. /preview followed by
+    /calculate) reuse the in-memory dataset instead of re-opening the file.
+    The file handle is closed once the data is loaded.
+    """
+    with xr.open_dataset(path_str, engine=NETCDF_ENGINE) as ds:
+        return ds.load()
+
 
 class CopernicusClient:
     """Client for interacting with Copernicus Marine Service API."""
@@ -57,6 +110,15 @@ class CopernicusClient:
             logger.error(f"Failed to login to Copernicus: {e}")
             return False
     
+    def warm_up(self) -> bool:
+        """
+        Log in ahead of the first request.
+        
+        Called at application startup so the first drift calculation
+        does not pay the login round-trip.
+        """
+        return self._ensure_login()
+    
     def get_currents_data(
         self,
         min_lat: float,
@@ -79,43 +141,16 @@ class CopernicusClient:
         Returns:
             xarray Dataset with 'uo' (eastward) and 'vo' (northward) current velocities
         """
-        cache_file = self._get_cache_path("currents", min_lat, max_lat, min_lon, max_lon, start_time, end_time)
-        
-        if use_cache and cache_file.exists():
-            logger.info(f"Loading currents data from cache: {cache_file}")
-            return xr.open_dataset(cache_file)
-        
-        if not self._ensure_login():
-            logger.error("Cannot download data: not logged in")
-            return None
-        
-        try:
-            import copernicusmarine
-            
-            logger.info(f"Downloading currents data for area ({min_lat:.2f}, {min_lon:.2f}) to ({max_lat:.2f}, {max_lon:.2f})")
-            
-            ds = copernicusmarine.open_dataset(
-                dataset_id=CURRENTS_PRODUCT_ID,
-                variables=["uo", "vo"],
-                minimum_latitude=min_lat,
-                maximum_latitude=max_lat,
-                minimum_longitude=min_lon,
-                maximum_longitude=max_lon,
-                start_datetime=start_time.isoformat(),
-                end_datetime=end_time.isoformat(),
-                minimum_depth=0,
-                maximum_depth=1
-            )
-            
-            # Cache the data
-            ds.to_netcdf(cache_file)
-            logger.info(f"Currents data cached to: {cache_file}")
-            
-            return ds
-            
-        except Exception as e:
-            logger.error(f"Failed to download currents data: {e}")
-            return None
+        return self._get_tiled_data(
+            "currents",
+            min_lat, max_lat, min_lon, max_lon,
+            start_time, end_time,
+            use_cache,
+            dataset_id=CURRENTS_PRODUCT_ID,
+            variables=["uo", "vo"],
+            minimum_depth=0,
+            maximum_depth=1
+        )
     
     def get_wind_data(
         self,
@@ -139,12 +174,87 @@ class CopernicusClient:
         Returns:
             xarray Dataset with wind velocity components
         """
-        cache_file = self._get_cache_path("wind", min_lat, max_lat, min_lon, max_lon, start_time, end_time)
+        return self._get_tiled_data(
+            "wind",
+            min_lat, max_lat, min_lon, max_lon,
+            start_time, end_time,
+            use_cache,
+            dataset_id=WIND_PRODUCT_ID,
+            variables=["eastward_wind", "northward_wind"]
+        )
+    
+    def _get_tiled_data(
+        self,
+        data_type: str,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        start_time: datetime,
+        end_time: datetime,
+        use_cache: bool,
+        **subset_kwargs
+    ) -> Optional[xr.Dataset]:
+        """
+        Assemble data for the requested area from cached or downloaded tiles.
+        
+        Tiles are keyed on their 1 degree cell and the exact request time
+        window, so overlapping requests for the same incident time and
+        projection (e.g. /preview then /calculate) are served from the
+        cache. Missing tiles are downloaded concurrently.
+        """
+        tiles = self._tiles_covering(min_lat, max_lat, min_lon, max_lon)
+        tile_files = [
+            self._get_tile_path(data_type, tile_lat, tile_lon, start_time, end_time)
+            for tile_lat, tile_lon in tiles
+        ]
         
-        if use_cache and cache_file.exists():
-            logger.info(f"Loading wind data from cache: {cache_file}")
-            return xr.open_dataset(cache_file)
+        datasets: list[Optional[xr.Dataset]] = [None] * len(tiles)
+        missing = []
+        for i, tile_file in enumerate(tile_files):
+            if use_cache and tile_file.exists():
+                logger.info(f"Loading {data_type} data from cache: {tile_file}")
+                datasets[i] = _open_cached(str(tile_file))
+            else:
+                missing.append(i)
+        
+        if missing:
+            # Log in once up front rather than from every download thread
+            if not self._ensure_login():
+                logger.error("Cannot download data: not logged in")
+                return None
+            
+            def download(i: int) -> Optional[xr.Dataset]:
+                tile_lat, tile_lon = tiles[i]
+                return self._download_tile(
+                    data_type, tile_lat, tile_lon, start_time, end_time, tile_files[i], **subset_kwargs
+                )
+            
+            with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(missing))) as pool:
+                for i, ds in zip(missing, pool.map(download, missing)):
+                    if ds is None:
+                        return None
+                    datasets[i] = ds
         
+        combined = xr.combine_by_coords(datasets) if len(datasets) > 1 else datasets[0]
+        return combined.sel(
+            latitude=slice(min_lat, max_lat),
+            longitude=slice(min_lon, max_lon)
+        )
+    
+    def _download_tile(
+        self,
+        data_type: str,
+        tile_lat: int,
+        tile_lon: int,
+        start_time: datetime,
+        end_time: datetime,
+        tile_file: Path,
+        dataset_id: str,
+        variables: list[str],
+        **subset_kwargs
+    ) -> Optional[xr.Dataset]:
+        """Download a single tile and store it in the cache."""
         if not self._ensure_login():
             logger.error("Cannot download data: not logged in")
             return None
@@ -152,42 +262,69 @@ class CopernicusClient:
         try:
             import copernicusmarine
             
-            logger.info(f"Downloading wind data for area ({min_lat:.2f}, {min_lon:.2f}) to ({max_lat:.2f}, {max_lon:.2f})")
+            logger.info(f"Downloading {data_type} data for tile ({tile_lat}, {tile_lon})")
             
             ds = copernicusmarine.open_dataset(
-                dataset_id=WIND_PRODUCT_ID,
-                variables=["eastward_wind", "northward_wind"],
-                minimum_latitude=min_lat,
-                maximum_latitude=max_lat,
-                minimum_longitude=min_lon,
-                maximum_longitude=max_lon,
+                dataset_id=dataset_id,
+                variables=variables,
+                minimum_latitude=tile_lat,
+                maximum_latitude=tile_lat + TILE_SIZE_DEG,
+                minimum_longitude=tile_lon,
+                maximum_longitude=tile_lon + TILE_SIZE_DEG,
                 start_datetime=start_time.isoformat(),
-                end_datetime=end_time.isoformat()
+                end_datetime=end_time.isoformat(),
+                **subset_kwargs
             )
             
-            # Cache the data
-            ds.to_netcdf(cache_file)
-            logger.info(f"Wind data cached to: {cache_file}")
+            # Tiles are half-open so grid points on a shared edge belong to
+            # exactly one tile and adjacent tiles combine without overlap
+            ds = ds.isel(
+                latitude=(ds["latitude"] < tile_lat + TILE_SIZE_DEG).values,
+                longitude=(ds["longitude"] < tile_lon + TILE_SIZE_DEG).values
+            )
+            
+            # Cache the data; load it first so the download happens only once
+            ds = _downcast(ds).load()
+            tile_file.parent.mkdir(parents=True, exist_ok=True)
+            ds.to_netcdf(tile_file, engine=NETCDF_ENGINE, encoding=_cache_encoding(ds))
+            logger.info(f"{data_type.capitalize()} data cached to: {tile_file}")
+            
+            # A rewritten tile invalidates anything loaded from its path.
+            # lru_cache cannot evict a single key; rewrites are rare enough
+            # (forced refreshes) that clearing it all is fine
+            _open_cached.cache_clear()
             
             return ds
             
         except Exception as e:
-            logger.error(f"Failed to download wind data: {e}")
+            logger.error(f"Failed to download {data_type} data: {e}")
             return None
     
-    def _get_cache_path(
-        self,
-        data_type: str,
+    @staticmethod
+    def _tiles_covering(
         min_lat: float,
         max_lat: float,
         min_lon: float,
-        max_lon: float,
+        max_lon: float
+    ) -> list[tuple[int, int]]:
+        """List the (lat, lon) south-west corners of the tiles covering a bbox."""
+        return [
+            (tile_lat, tile_lon)
+            for tile_lat in range(math.floor(min_lat), math.floor(max_lat) + 1, TILE_SIZE_DEG)
+            for tile_lon in range(math.floor(min_lon), math.floor(max_lon) + 1, TILE_SIZE_DEG)
+        ]
+    
+    def _get_tile_path(
+        self,
+        data_type: str,
+        tile_lat: int,
+        tile_lon: int,
         start_time: datetime,
         end_time: datetime
     ) -> Path:
-        """Generate a cache file path for the given parameters."""
-        filename = f"{data_type}_{min_lat:.2f}_{max_lat:.2f}_{min_lon:.2f}_{max_lon:.2f}_{start_time.strftime('%Y%m%d%H')}_{end_time.strftime('%Y%m%d%H')}.nc"
-        return self.cache_dir / filename
+        """Generate a cache file path for a tile."""
+        filename = f"{tile_lat}_{tile_lon}_{start_time.strftime('%Y%m%d%H')}_{end_time.strftime('%Y%m%d%H')}.nc"
+        return self.cache_dir / data_type / filename
 
 
 # Singleton instance
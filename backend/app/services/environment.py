@@ -0,0 +1,155 @@
+"""
+Gridded environmental fields (currents, wind) for particle sampling.
+Materializes xarray datasets into NumPy arrays once so the Monte Carlo
+step can sample every particle with a single vectorized interpolation.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GriddedField:
+    """A 2-component vector field on a regular time/lat/lon grid."""
+    times: np.ndarray  # int64 nanoseconds since epoch, ascending
+    lats: np.ndarray   # ascending
+    lons: np.ndarray   # ascending
+    u: np.ndarray      # float32 (time, lat, lon)
+    v: np.ndarray      # float32 (time, lat, lon)
+    # Grid spacing when an axis is regular (Copernicus grids are), else None
+    lat_step: Optional[float] = field(init=False)
+    lon_step: Optional[float] = field(init=False)
+    
+    def __post_init__(self):
+        self.lat_step = _regular_step(self.lats)
+        self.lon_step = _regular_step(self.lons)
+    
+    @classmethod
+    def from_dataset(cls, ds: xr.Dataset, u_var: str, v_var: str) -> Optional["GriddedField"]:
+        """
+        Build a field from an xarray Dataset.
+        
+        Extra dimensions (e.g. depth) are reduced to their first level and
+        missing values (land cells) are treated as zero velocity.
+        
+        Returns:
+            GriddedField, or None if the dataset cannot be used
+        """
+        try:
+            ds = ds.sortby(["time", "latitude", "longitude"])
+            
+            def to_array(da: xr.DataArray) -> np.ndarray:
+                extra_dims = [d for d in da.dims if d not in ("time", "latitude", "longitude")]
+                da = da.isel({d: 0 for d in extra_dims})
+                values = da.transpose("time", "latitude", "longitude").values.astype(np.float32)
+                return np.nan_to_num(values, nan=0.0)
+            
+            return cls(
+                times=ds["time"].values.astype("datetime64[ns]").view(np.int64),
+                lats=ds["latitude"].values.astype(np.float64),
+                lons=ds["longitude"].values.astype(np.float64),
+                u=to_array(ds[u_var]),
+                v=to_array(ds[v_var])
+            )
+        except Exception as e:
+            logger.warning(f"Failed to materialize {u_var}/{v_var} field: {e}")
+            return None
+    
+    def time_weights(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bracketing time slices and blend weights for a series of times.
+        
+        Args:
+            times: int64 nanoseconds since epoch
+        
+        Returns:
+            Tuple of (lower index, upper index, float32 weight of the upper
+            slice); the float32 weight keeps sampled values float32
+        """
+        nt = len(self.times)
+        t0 = np.clip(np.searchsorted(self.times, times, side="right") - 1, 0, max(nt - 2, 0))
+        t1 = np.minimum(t0 + 1, nt - 1)
+        span = self.times[t1] - self.times[t0]
+        wt = np.where(span > 0, (times - self.times[t0]) / np.maximum(span, 1), 0.0)
+        return t0, t1, np.clip(wt, 0.0, 1.0).astype(np.float32)
+    
+    def sample_slices(
+        self,
+        t0: int,
+        t1: int,
+        wt: float,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the field at particle positions between two time slices.
+        
+        Bilinear in space and linear in time (t0, t1 and wt come from
+        time_weights); positions outside the grid are clamped to its edges.
+        
+        Returns:
+            Tuple of (u, v) float32 arrays, one value per particle
+        """
+        # Fractional grid indices of every particle
+        iy0, iy1, wy = _bracket(self.lats, lats, self.lat_step)
+        ix0, ix1, wx = _bracket(self.lons, lons, self.lon_step)
+        
+        def bilinear(grid: np.ndarray) -> np.ndarray:
+            return (
+                (grid[iy0, ix0] * (1 - wx) + grid[iy0, ix1] * wx) * (1 - wy)
+                + (grid[iy1, ix0] * (1 - wx) + grid[iy1, ix1] * wx) * wy
+            )
+        
+        u = bilinear(self.u[t0]) * (1 - wt) + bilinear(self.u[t1]) * wt
+        v = bilinear(self.v[t0]) * (1 - wt) + bilinear(self.v[t1]) * wt
+        return u, v
+
+
+def step_times(start_time: datetime, num_steps: int, step_hours: float) -> np.ndarray:
+    """Times of every simulation step as int64 nanoseconds since epoch."""
+    step_ns = int(round(step_hours * 3600 * 1e9))
+    return _to_ns(start_time) + np.arange(num_steps, dtype=np.int64) * step_ns
+
+
+def _to_ns(time: datetime) -> int:
+    """Convert a (possibly timezone-aware) datetime to UTC nanoseconds."""
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return int(np.datetime64(time, "ns").view(np.int64))
+
+
+def _regular_step(axis: np.ndarray) -> Optional[float]:
+    """Spacing of an evenly spaced axis, or None if the spacing varies."""
+    if len(axis) < 2:
+        return None
+    step = (axis[-1] - axis[0]) / (len(axis) - 1)
+    if step <= 0 or not np.allclose(np.diff(axis), step, rtol=1e-4, atol=0):
+        return None
+    return float(step)
+
+
+def _bracket(
+    axis: np.ndarray,
+    values: np.ndarray,
+    step: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lower/upper grid indices and interpolation weights for values on an axis.
+    
+    On a regular axis (step given) the fractional index is plain arithmetic;
+    otherwise it is found by binary search with np.interp.
+    """
+    n = len(axis)
+    if step is not None:
+        position = np.clip((values - axis[0]) * (1.0 / step), 0, n - 1)
+    else:
+        position = np.interp(values, axis, np.arange(n, dtype=np.float64))
+    lower = np.minimum(position.astype(np.intp), max(n - 2, 0))
+    upper = np.minimum(lower + 1, n - 1)
+    return lower, upper, (position - lower).astype(np.float32)
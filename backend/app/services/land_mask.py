@@ -0,0 +1,39 @@
+"""
+Land mask lookups for particle stranding.
+Indexes the ~1 km raster that global_land_mask already holds in memory
+directly, so a land check is a single array read per particle and can run
+inside the Numba step kernel.
+"""
+import numpy as np
+from global_land_mask import globe
+
+from app.utils.jit import njit
+
+# (mask, lat0, dlat_inv, lon0, dlon_inv): the raster is True over water,
+# rows run north to south and columns west to east. These are private
+# attributes of global_land_mask, so requirements.txt pins the version they
+# were verified against; rebuilding the raster through globe.is_ocean would
+# hold a second ~1 GB copy in memory
+LAND_MASK = (
+    globe._mask,
+    float(globe._lat[0]),
+    float(1.0 / (globe._lat[1] - globe._lat[0])),
+    float(globe._lon[0]),
+    float(1.0 / (globe._lon[1] - globe._lon[0]))
+)
+
+
+@njit(cache=True, inline='always')
+def is_land_point(mask, lat0, dlat_inv, lon0, dlon_inv, lat, lon):
+    """Whether a position is on land; positions off the raster use its edge."""
+    iy = min(max(int((lat - lat0) * dlat_inv), 0), mask.shape[0] - 1)
+    ix = min(max(int((lon - lon0) * dlon_inv), 0), mask.shape[1] - 1)
+    return not mask[iy, ix]
+
+
+def is_land(lats: np.ndarray, lons: np.ndarray, land: tuple = LAND_MASK) -> np.ndarray:
+    """Vectorized land check, equivalent to globe.is_land without its copies."""
+    mask, lat0, dlat_inv, lon0, dlon_inv = land
+    iy = np.clip(((lats - lat0) * dlat_inv).astype(np.intp), 0, mask.shape[0] - 1)
+    ix = np.clip(((lons - lon0) * dlon_inv).astype(np.intp), 0, mask.shape[1] - 1)
+    return ~mask[iy, ix]
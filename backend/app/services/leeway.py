@@ -2,11 +2,20 @@
 Leeway drift model implementation.
 Calculates the velocity of a drifting object based on ocean currents and wind.
 """
+import math
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 
 from app.models.drift import ObjectType
-from app.models.leeway_coefficients import get_leeway_coefficient
+from app.models.leeway_coefficients import DIVERGENCE_RAD, LEEWAY_MEAN
+from app.utils.jit import njit
+
+# Earth's radius in meters
+EARTH_RADIUS = 6371000
+
+# Meters per degree latitude (constant) and seconds per hour
+_M_PER_DEG_LAT = (2 * math.pi * EARTH_RADIUS) / 360
+_SEC_PER_HOUR = 3600.0
 
 
 def calculate_leeway_velocity(
@@ -39,20 +48,18 @@ def calculate_leeway_velocity(
     Returns:
         Tuple of (u, v) velocity components in m/s
     """
-    coeff = get_leeway_coefficient(object_type)
-    
     # Get average leeway percentage
-    leeway_pct = (coeff.leeway_percent_min + coeff.leeway_percent_max) / 2
+    leeway_pct = LEEWAY_MEAN[object_type]
     
     # Calculate wind speed and direction
-    wind_speed = np.sqrt(wind_u**2 + wind_v**2)
+    wind_speed = np.hypot(wind_u, wind_v)
     wind_direction = np.arctan2(wind_v, wind_u)  # radians
     
     # Calculate leeway velocity magnitude
     leeway_speed = wind_speed * leeway_pct
     
     # Apply divergence angle
-    divergence_rad = np.radians(coeff.divergence_angle * divergence_direction)
+    divergence_rad = DIVERGENCE_RAD[object_type] * divergence_direction
     leeway_direction = wind_direction + divergence_rad
     
     # Convert leeway velocity to components
@@ -66,61 +73,54 @@ def calculate_leeway_velocity(
     return (total_u, total_v)
 
 
-def calculate_leeway_velocity_with_noise(
-    current_u: float,
-    current_v: float,
-    wind_u: float,
-    wind_v: float,
-    object_type: ObjectType,
+# float32 literal for the step kernel; a plain 1.0 would promote it to float64
+_ONE = np.float32(1.0)
+
+
+@njit(fastmath=True, cache=True, inline='always')
+def _leeway_point(cu, cv, wu, wv, nc_u, nc_v, nw_u, nw_v, leeway_pct, divergence_rad):
+    """Noisy leeway velocity of a single particle; inlined into the step kernel."""
+    cu = cu * (_ONE + nc_u)
+    cv = cv * (_ONE + nc_v)
+    wu = wu * (_ONE + nw_u)
+    wv = wv * (_ONE + nw_v)
+    
+    leeway_speed = math.sqrt(wu * wu + wv * wv) * leeway_pct
+    leeway_direction = math.atan2(wv, wu) + divergence_rad
+    
+    return (
+        cu + leeway_speed * math.cos(leeway_direction),
+        cv + leeway_speed * math.sin(leeway_direction)
+    )
+
+
+def draw_leeway_noise(
+    rng: np.random.Generator,
+    n: int,
     current_noise_std: float = 0.05,
     wind_noise_std: float = 0.1,
-    rng: np.random.Generator = None
-) -> Tuple[float, float]:
+    num_steps: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Calculate drift velocity with added uncertainty for Monte Carlo simulation.
+    Draw the random inputs of the leeway model for N particles in one shot.
     
     Args:
-        current_u, current_v: Ocean current velocity components (m/s)
-        wind_u, wind_v: Wind velocity components (m/s)
-        object_type: Type of object
-        current_noise_std: Standard deviation for current noise (fraction)
-        wind_noise_std: Standard deviation for wind noise (fraction)
-        rng: Random number generator
-        
+        num_steps: If given, draw for every time step at once; each
+            returned array then has a leading axis of this length
+    
     Returns:
-        Tuple of (u, v) velocity components with added noise
+        Tuple of (noise_c, noise_w, div_dir, lee_pct): (2, N) scaled current
+        and wind noise, divergence directions in {-1, 0, 1} and uniform
+        [0, 1) samples placing the leeway within its coefficient range
     """
-    if rng is None:
-        rng = np.random.default_rng()
-    
-    coeff = get_leeway_coefficient(object_type)
-    
-    # Add noise to current
-    noisy_current_u = current_u * (1 + rng.normal(0, current_noise_std))
-    noisy_current_v = current_v * (1 + rng.normal(0, current_noise_std))
-    
-    # Add noise to wind
-    noisy_wind_u = wind_u * (1 + rng.normal(0, wind_noise_std))
-    noisy_wind_v = wind_v * (1 + rng.normal(0, wind_noise_std))
-    
-    # Randomly select divergence direction
-    divergence_direction = rng.choice([-1, 0, 1])
-    
-    # Vary leeway coefficient within its range
-    leeway_pct = rng.uniform(coeff.leeway_percent_min, coeff.leeway_percent_max)
-    
-    # Calculate wind contribution
-    wind_speed = np.sqrt(noisy_wind_u**2 + noisy_wind_v**2)
-    wind_direction = np.arctan2(noisy_wind_v, noisy_wind_u)
-    
-    leeway_speed = wind_speed * leeway_pct
-    divergence_rad = np.radians(coeff.divergence_angle * divergence_direction)
-    leeway_direction = wind_direction + divergence_rad
-    
-    leeway_u = leeway_speed * np.cos(leeway_direction)
-    leeway_v = leeway_speed * np.sin(leeway_direction)
-    
-    return (noisy_current_u + leeway_u, noisy_current_v + leeway_v)
+    lead = () if num_steps is None else (num_steps,)
+    noise_c = rng.standard_normal(size=lead + (2, n), dtype=np.float32)
+    noise_c *= current_noise_std
+    noise_w = rng.standard_normal(size=lead + (2, n), dtype=np.float32)
+    noise_w *= wind_noise_std
+    div_dir = rng.integers(-1, 2, size=lead + (n,), dtype=np.int8)
+    lee_pct = rng.random(lead + (n,), dtype=np.float32)
+    return noise_c, noise_w, div_dir, lee_pct
 
 
 def meters_per_second_to_degrees_per_hour(
@@ -139,18 +139,11 @@ def meters_per_second_to_degrees_per_hour(
     Returns:
         Tuple of (delta_lon, delta_lat) in degrees per hour
     """
-    # Earth's radius in meters
-    EARTH_RADIUS = 6371000
-    
-    # Meters per degree latitude (constant)
-    meters_per_deg_lat = (2 * np.pi * EARTH_RADIUS) / 360
-    
     # Meters per degree longitude (varies with latitude)
-    meters_per_deg_lon = meters_per_deg_lat * np.cos(np.radians(latitude))
+    meters_per_deg_lon = _M_PER_DEG_LAT * math.cos(math.radians(latitude))
     
     # Convert m/s to degrees/hour
-    # 1 hour = 3600 seconds
-    delta_lat_per_hour = (velocity_v * 3600) / meters_per_deg_lat
-    delta_lon_per_hour = (velocity_u * 3600) / meters_per_deg_lon if meters_per_deg_lon > 0 else 0
+    delta_lat_per_hour = (velocity_v * _SEC_PER_HOUR) / _M_PER_DEG_LAT
+    delta_lon_per_hour = (velocity_u * _SEC_PER_HOUR) / meters_per_deg_lon if meters_per_deg_lon > 0 else 0
     
     return (delta_lon_per_hour, delta_lat_per_hour)
@@ -3,39 +3,34 @@ Monte Carlo particle tracking simulation for drift prediction.
 """
 import logging
 import time
-from datetime import datetime, timedelta
-from typing import Optional, Tuple, List
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 import numpy as np
 import xarray as xr
 from scipy import ndimage
-from shapely.geometry import MultiPoint, Polygon
+from scipy.spatial import ConvexHull, QhullError
 from shapely.ops import unary_union
-from global_land_mask import globe
 
 from app.models.drift import ObjectType, DriftResponse
-from app.services.leeway import (
-    calculate_leeway_velocity_with_noise,
-    meters_per_second_to_degrees_per_hour
-)
+from app.models.leeway_coefficients import LEEWAY_TABLE, OBJECT_TYPE_INDEX
+from app.services.environment import GriddedField, step_times
+from app.services.land_mask import LAND_MASK
+from app.services.leeway import draw_leeway_noise
+from app.services import _mc_kernel
+from app.utils.jit import NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class Particle:
-    """A particle representing a possible position of the drifting object."""
-    lat: float
-    lon: float
-    
-
 @dataclass
 class SimulationResult:
     """Result of a Monte Carlo drift simulation."""
-    final_positions: List[Tuple[float, float]]  # (lat, lon) pairs
-    search_polygon: dict  # GeoJSON
-    priority_polygon: dict  # GeoJSON (80% confidence)
+    final_lats: np.ndarray  # float32, one per particle
+    final_lons: np.ndarray  # float32, one per particle
+    search_polygon: dict  # GeoJSON, ring as a (V, 2) array
+    priority_polygon: dict  # GeoJSON (80% confidence), ring as a (V, 2) array
     mean_drift_km: float
     simulation_time_seconds: float
     stranded_particle_count: int = 0
@@ -58,6 +53,21 @@ class MonteCarloSimulator:
         """
         self.currents_data = currents_data
         self.wind_data = wind_data
+        
+        # Materialize the fields once so each step samples all particles
+        # with a single vectorized interpolation
+        self._currents_field = None
+        self._wind_field = None
+        
+        if currents_data is not None:
+            self._currents_field = GriddedField.from_dataset(currents_data, 'uo', 'vo')
+        
+        if wind_data is not None:
+            # Try different variable names
+            wind_u_var = 'eastward_wind' if 'eastward_wind' in wind_data else 'u10'
+            wind_v_var = 'northward_wind' if 'northward_wind' in wind_data else 'v10'
+            self._wind_field = GriddedField.from_dataset(wind_data, wind_u_var, wind_v_var)
+
     
     def run_simulation(
         self,
@@ -87,201 +97,314 @@ class MonteCarloSimulator:
         logger.info(f"Starting Monte Carlo simulation with {num_particles} particles")
         
         rng = np.random.default_rng()
+        particles_lat, particles_lon, stranded = self._simulate_particles(
+            start_lat, start_lon, start_time, projection_hours,
+            object_type, num_particles, time_step_hours, rng
+        )
+        
+        result = self._build_result(start_lat, start_lon, particles_lat, particles_lon, stranded, sim_start)
+        logger.info(
+            f"Simulation completed in {result.simulation_time_seconds:.2f} seconds. "
+            f"Stranded particles: {result.stranded_particle_count}/{num_particles}"
+        )
+        return result
+    
+    def run_simulation_streaming(
+        self,
+        start_lat: float,
+        start_lon: float,
+        start_time: datetime,
+        projection_hours: int,
+        object_type: ObjectType,
+        num_particles: int = 1000,
+        time_step_hours: float = 1.0,
+        num_batches: int = 10
+    ) -> Iterator[SimulationResult]:
+        """
+        Run the Monte Carlo simulation in batches, yielding partial results.
+        
+        Particles are independent, so the simulation is split into
+        num_batches groups. After each group a result covering every
+        particle simulated so far is yielded; the last one covers all
+        num_particles and is equivalent to run_simulation.
+        
+        Args:
+            Same as run_simulation, plus:
+            num_batches: Number of partial results to yield
+            
+        Yields:
+            SimulationResult for the particles simulated so far
+        """
+        sim_start = time.time()
+        logger.info(f"Starting streaming Monte Carlo simulation with {num_particles} particles")
+        
+        rng = np.random.default_rng()
+        lats, lons, stranded = [], [], []
+        
+        for batch_size in np.diff(np.linspace(0, num_particles, num_batches + 1).astype(int)):
+            if batch_size == 0:
+                continue
+            
+            batch_lat, batch_lon, batch_stranded = self._simulate_particles(
+                start_lat, start_lon, start_time, projection_hours,
+                object_type, int(batch_size), time_step_hours, rng
+            )
+            lats.append(batch_lat)
+            lons.append(batch_lon)
+            stranded.append(batch_stranded)
+            
+            yield self._build_result(
+                start_lat, start_lon,
+                np.concatenate(lats), np.concatenate(lons), np.concatenate(stranded),
+                sim_start
+            )
+    
+    def _simulate_particles(
+        self,
+        start_lat: float,
+        start_lon: float,
+        start_time: datetime,
+        projection_hours: int,
+        object_type: ObjectType,
+        num_particles: int,
+        time_step_hours: float,
+        rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance a group of particles from the LKP to the end of the projection.
+        
+        Returns:
+            Tuple of (final latitudes, final longitudes, stranded mask)
+        """
+        # Resolve the object type once; the step works on plain float coefficients
+        object_index = OBJECT_TYPE_INDEX[object_type]
+        leeway_params = LEEWAY_TABLE[object_index]
+        dt = np.float32(time_step_hours)
         
         # Initialize particles at starting position with small initial spread
         initial_spread = 0.001  # ~100m spread
-        particles_lat = np.full(num_particles, start_lat) + rng.normal(0, initial_spread, num_particles)
-        particles_lon = np.full(num_particles, start_lon) + rng.normal(0, initial_spread, num_particles)
+        # Particle state is float32: ~0.4 m resolution at these latitudes,
+        # far below the ~9 km Copernicus grid spacing
+        particles_lat = rng.standard_normal(num_particles, dtype=np.float32)
+        particles_lat *= initial_spread
+        particles_lat += start_lat
+        particles_lon = rng.standard_normal(num_particles, dtype=np.float32)
+        particles_lon *= initial_spread
+        particles_lon += start_lon
         
         # Track stranded particles (those that have hit land)
         stranded = np.zeros(num_particles, dtype=bool)
         
-        # Number of time steps
+        # Number of time steps; environmental time slices are resolved once
+        # for the whole projection
         num_steps = int(projection_hours / time_step_hours)
-        current_time = start_time
+        current_steps, wind_steps = self._prepare_time_steps(start_time, num_steps, time_step_hours)
+        
+        # Scratch space for the NumPy step, reused by every step
+        work = None if NUMBA_AVAILABLE else _mc_kernel.make_work_buffers()
+        
+        # Draw the random inputs of every step up front; each step takes the
+        # columns of its active particles
+        noise_c, noise_w, div_dir, lee_pct = draw_leeway_noise(
+            rng, num_particles, num_steps=num_steps
+        )
         
         # Run simulation
         for step in range(num_steps):
-            # Get environmental data for current time
-            current_u, current_v = self._get_current_at_time(current_time, particles_lat, particles_lon)
-            wind_u, wind_v = self._get_wind_at_time(current_time, particles_lat, particles_lon)
-            
             # Get indices of active (non-stranded) particles
-            active_indices = np.where(~stranded)[0]
+            active_indices = np.flatnonzero(~stranded)
             
             if len(active_indices) == 0:
                 break
             
-            # Update each particle (only active ones)
-            # Store previous positions to revert if stranded
-            prev_lats = particles_lat[active_indices].copy()
-            prev_lons = particles_lon[active_indices].copy()
-
-            for idx, i in enumerate(active_indices):
-                # Calculate velocity with noise
-                vel_u, vel_v = calculate_leeway_velocity_with_noise(
-                    current_u[i] if isinstance(current_u, np.ndarray) else current_u,
-                    current_v[i] if isinstance(current_v, np.ndarray) else current_v,
-                    wind_u[i] if isinstance(wind_u, np.ndarray) else wind_u,
-                    wind_v[i] if isinstance(wind_v, np.ndarray) else wind_v,
-                    object_type,
-                    rng=rng
-                )
-                
-                # Convert velocity to position change
-                delta_lon, delta_lat = meters_per_second_to_degrees_per_hour(
-                    vel_u, vel_v, particles_lat[i]
-                )
-                
-                # Update position
-                particles_lat[i] += delta_lat * time_step_hours
-                particles_lon[i] += delta_lon * time_step_hours
+            # Positions of active particles at the start of the step
+            prev_lats = particles_lat[active_indices]
+            prev_lons = particles_lon[active_indices]
             
-            # Check for stranding after position update
-            if len(active_indices) > 0:
-                newly_stranded_mask = globe.is_land(particles_lat[active_indices], particles_lon[active_indices])
-                
-                # For newly stranded particles, revert to previous position (last known water position)
-                if np.any(newly_stranded_mask):
-                    stranded_indices = active_indices[newly_stranded_mask]
-                    # Map back to the local index in active_indices to get prev pos
-                    local_indices = np.where(newly_stranded_mask)[0]
-                    
-                    particles_lat[stranded_indices] = prev_lats[local_indices]
-                    particles_lon[stranded_indices] = prev_lons[local_indices]
-                    
-                    stranded[stranded_indices] = True
+            # Get environmental data for this step at active particles only
+            current_u, current_v = self._get_current_at_time(current_steps[step], prev_lats, prev_lons)
+            wind_u, wind_v = self._get_wind_at_time(wind_steps[step], prev_lats, prev_lons)
             
-            current_time += timedelta(hours=time_step_hours)
-        
-        # Calculate results
-        final_positions = list(zip(particles_lat, particles_lon))
+            # take() keeps the (2, N) noise C-contiguous like the kernel expects
+            step_noise = (
+                noise_c[step].take(active_indices, axis=1),
+                noise_w[step].take(active_indices, axis=1),
+                div_dir[step, active_indices],
+                lee_pct[step, active_indices]
+            )
+            
+            new_lats = np.empty_like(prev_lats)
+            new_lons = np.empty_like(prev_lons)
+            on_land = np.empty(len(active_indices), dtype=np.bool_)
+            if NUMBA_AVAILABLE:
+                # Fused leeway, unit conversion, position update and land check
+                with _mc_kernel.STEP_LOCK:
+                    _mc_kernel.step(
+                        prev_lats, prev_lons,
+                        current_u, current_v, wind_u, wind_v,
+                        leeway_params, *step_noise,
+                        dt, LAND_MASK, new_lats, new_lons, on_land
+                    )
+            else:
+                _mc_kernel.step_numpy(
+                    prev_lats, prev_lons,
+                    current_u, current_v, wind_u, wind_v,
+                    leeway_params, *step_noise,
+                    dt, LAND_MASK, new_lats, new_lons, on_land, work
+                )
+            
+            # Particles that hit land were left at their last water position
+            particles_lat[active_indices] = new_lats
+            particles_lon[active_indices] = new_lons
+            stranded[active_indices[on_land]] = True
         
+        return particles_lat, particles_lon, stranded
+    
+    def _build_result(
+        self,
+        start_lat: float,
+        start_lon: float,
+        particles_lat: np.ndarray,
+        particles_lon: np.ndarray,
+        stranded: np.ndarray,
+        sim_start: float
+    ) -> SimulationResult:
+        """Build polygons and statistics from final particle positions."""
         # Calculate polygons
-        search_polygon = self._create_convex_hull(final_positions)
-        priority_polygon = self._create_density_polygon(final_positions, confidence=0.80)
+        search_polygon = self._create_convex_hull(particles_lat, particles_lon)
+        priority_polygon = self._create_density_polygon(particles_lat, particles_lon, confidence=0.80)
         
         # Calculate mean drift distance
         mean_drift_km = self._calculate_mean_drift(
             start_lat, start_lon, particles_lat, particles_lon
         )
         
-        sim_time = time.time() - sim_start
-        stranded_count = np.sum(stranded)
-        logger.info(f"Simulation completed in {sim_time:.2f} seconds. Stranded particles: {stranded_count}/{num_particles}")
-        
         return SimulationResult(
-            final_positions=final_positions,
+            final_lats=particles_lat,
+            final_lons=particles_lon,
             search_polygon=search_polygon,
             priority_polygon=priority_polygon,
             mean_drift_km=mean_drift_km,
-            simulation_time_seconds=sim_time,
-            stranded_particle_count=int(stranded_count)
+            simulation_time_seconds=time.time() - sim_start,
+            stranded_particle_count=int(np.sum(stranded))
         )
     
+    def _prepare_time_steps(
+        self,
+        start_time: datetime,
+        num_steps: int,
+        time_step_hours: float
+    ) -> Tuple[list, list]:
+        """
+        Precompute the bracketing time slices of every step for each field.
+        
+        Returns:
+            Tuple of (current, wind) lists with one (t0, t1, wt) entry per
+            step, or None entries for a field without data
+        """
+        times = step_times(start_time, num_steps, time_step_hours)
+        
+        def per_step(field: Optional[GriddedField]) -> list:
+            if field is None:
+                return [None] * num_steps
+            return list(zip(*field.time_weights(times)))
+        
+        return per_step(self._currents_field), per_step(self._wind_field)
+    
     def _get_current_at_time(
         self,
-        time: datetime,
+        time_slices: Optional[Tuple[int, int, np.float32]],
         lats: np.ndarray,
         lons: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Get current velocity at given positions and time."""
-        if self.currents_data is None:
+        """
+        Get current velocity at given positions for a simulation step.
+        
+        Args:
+            time_slices: The step's (t0, t1, wt) from _prepare_time_steps
+            lats, lons: Particle positions
+        
+        Always returns float32 arrays shaped like lats, as the step kernel expects.
+        """
+        if self._currents_field is None:
             # Return default values if no data available
             return np.zeros_like(lats), np.zeros_like(lons)
         
-        try:
-            # Interpolate current data to particle positions
-            ds = self.currents_data.sel(time=time, method='nearest')
-            
-            # Get mean values for the area as fallback
-            mean_u = float(ds['uo'].mean())
-            mean_v = float(ds['vo'].mean())
-            
-            return np.full_like(lats, mean_u), np.full_like(lons, mean_v)
-            
-        except Exception as e:
-            logger.warning(f"Failed to get current data: {e}")
-            return np.zeros_like(lats), np.zeros_like(lons)
+        return self._currents_field.sample_slices(*time_slices, lats, lons)
     
     def _get_wind_at_time(
         self,
-        time: datetime,
+        time_slices: Optional[Tuple[int, int, np.float32]],
         lats: np.ndarray,
         lons: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Get wind velocity at given positions and time."""
-        if self.wind_data is None:
+        """
+        Get wind velocity at given positions for a simulation step.
+        
+        Args:
+            time_slices: The step's (t0, t1, wt) from _prepare_time_steps
+            lats, lons: Particle positions
+        
+        Always returns float32 arrays shaped like lats, as the step kernel expects.
+        """
+        if self._wind_field is None:
             # Return default moderate wind if no data
             default_wind = 5.0  # m/s
             return np.full_like(lats, default_wind * 0.5), np.full_like(lons, default_wind * 0.5)
         
-        try:
-            ds = self.wind_data.sel(time=time, method='nearest')
-            
-            # Try different variable names
-            wind_u_var = 'eastward_wind' if 'eastward_wind' in ds else 'u10'
-            wind_v_var = 'northward_wind' if 'northward_wind' in ds else 'v10'
-            
-            mean_u = float(ds[wind_u_var].mean())
-            mean_v = float(ds[wind_v_var].mean())
-            
-            return np.full_like(lats, mean_u), np.full_like(lons, mean_v)
-            
-        except Exception as e:
-            logger.warning(f"Failed to get wind data: {e}")
-            return np.full_like(lats, 2.5), np.full_like(lons, 2.5)
+        return self._wind_field.sample_slices(*time_slices, lats, lons)
     
-    def _create_convex_hull(self, positions: List[Tuple[float, float]]) -> dict:
+    def _create_convex_hull(self, lats: np.ndarray, lons: np.ndarray) -> dict:
         """Create a GeoJSON polygon from the convex hull of positions."""
-        points = MultiPoint([(lon, lat) for lat, lon in positions])
-        hull = points.convex_hull
-        
-        if isinstance(hull, Polygon):
-            coords = [list(hull.exterior.coords)]
-        else:
-            # Handle edge cases
-            coords = [[]]
-            
+        return self._hull_polygon(np.column_stack([lons, lats]).astype(np.float64))
+    
+    def _hull_polygon(self, points: np.ndarray) -> dict:
+        """Create a GeoJSON polygon from the convex hull of (lon, lat) rows."""
+        try:
+            hull = ConvexHull(points)
+        except (QhullError, ValueError):
+            # Handle edge cases (fewer than 3 points, all collinear)
+            return {"type": "Polygon", "coordinates": [[]]}
+        
+        # Qhull returns 2-D hull vertices counter-clockwise; close the ring.
+        # The ring stays a (V, 2) array; orjson serializes it at the API edge
+        ring = points[np.append(hull.vertices, hull.vertices[0])]
+        
         return {
             "type": "Polygon",
-            "coordinates": coords
+            "coordinates": [ring]
         }
     
     def _create_density_polygon(
         self,
-        positions: List[Tuple[float, float]],
+        lats: np.ndarray,
+        lons: np.ndarray,
         confidence: float = 0.80
     ) -> dict:
         """Create a polygon containing the specified percentage of particles."""
-        if not positions:
+        if len(lats) == 0:
             return {"type": "Polygon", "coordinates": [[]]}
-            
-        lats = np.array([p[0] for p in positions])
-        lons = np.array([p[1] for p in positions])
         
-        # Calculate center
-        center_lat = np.mean(lats)
-        center_lon = np.mean(lons)
+        # (lon, lat) rows, built once for both the distances and the hull
+        points = np.column_stack([lons, lats]).astype(np.float64)
         
         # Calculate distances from center
-        distances = np.sqrt((lats - center_lat)**2 + (lons - center_lon)**2)
+        offsets = points - points.mean(axis=0)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
         
         # Find threshold distance for confidence interval
-        sorted_indices = np.argsort(distances)
-        cutoff_index = int(len(positions) * confidence)
-        
-        # Select the closest points
-        selected_indices = sorted_indices[:cutoff_index]
+        cutoff_index = int(len(lats) * confidence)
         
         # If too few points, just return hull of all or empty
-        if len(selected_indices) < 3:
-            selected_positions = positions
-        else:
-            selected_positions = [positions[i] for i in selected_indices]
+        if cutoff_index < 3:
+            return self._hull_polygon(points)
+        
+        # Select the closest points; their order does not matter for the
+        # hull, so a partial partition is enough
+        selected_indices = np.argpartition(distances, cutoff_index - 1)[:cutoff_index]
             
         # Create convex hull of these points
-        return self._create_convex_hull(selected_positions)
+        return self._hull_polygon(points[selected_indices])
     
     def _calculate_mean_drift(
         self,
@@ -291,16 +414,13 @@ class MonteCarloSimulator:
         end_lons: np.ndarray
     ) -> float:
         """Calculate mean drift distance in kilometers."""
-        # Haversine formula
+        # Haversine formula; arcsin(sqrt(a)) equals arctan2(sqrt(a), sqrt(1-a))
+        # for a in [0, 1] and needs fewer temporaries
         R = 6371  # Earth's radius in km
         
-        lat1 = np.radians(start_lat)
-        lat2 = np.radians(end_lats)
-        dlat = lat2 - lat1
-        dlon = np.radians(end_lons - start_lon)
-        
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-        
-        distances = R * c
-        return float(np.mean(distances))
+        a = (
+            np.sin(np.radians(end_lats - start_lat) * 0.5) ** 2
+            + np.cos(np.radians(start_lat)) * np.cos(np.radians(end_lats))
+            * np.sin(np.radians(end_lons - start_lon) * 0.5) ** 2
+        )
+        return float(2 * R * np.mean(np.arcsin(np.sqrt(a))))
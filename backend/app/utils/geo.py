@@ -2,6 +2,7 @@
 Geospatial utility functions.
 """
 import math
+from functools import lru_cache
 from typing import Tuple
 
 
@@ -27,7 +28,8 @@ def haversine_distance(
     dlon = math.radians(lon2 - lon1)
     
     a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    # Rounding can push a just past 1 for near-antipodal points
+    c = 2 * math.asin(math.sqrt(min(a, 1.0)))
     
     return R * c
 
@@ -40,6 +42,9 @@ def create_bounding_box(
     """
     Create a bounding box around a center point.
     
+    Inputs are rounded (~100 m for the center, 0.1 km for the radius) so
+    repeated requests for the same LKP hit the cache.
+    
     Args:
         center_lat, center_lon: Center coordinates
         radius_km: Radius in kilometers
@@ -47,6 +52,18 @@ def create_bounding_box(
     Returns:
         Tuple of (min_lat, max_lat, min_lon, max_lon)
     """
+    return _create_bounding_box_cached(
+        round(center_lat, 3), round(center_lon, 3), round(radius_km, 1)
+    )
+
+
+@lru_cache(maxsize=256)
+def _create_bounding_box_cached(
+    center_lat: float,
+    center_lon: float,
+    radius_km: float
+) -> Tuple[float, float, float, float]:
+    """Memoized implementation of create_bounding_box."""
     # Approximate degrees per km
     km_per_deg_lat = 111.0
     km_per_deg_lon = 111.0 * math.cos(math.radians(center_lat))
@@ -0,0 +1,32 @@
+"""
+Optional Numba JIT support.
+Falls back to plain Python when numba is not installed.
+"""
+import os
+
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def usable_cpu_count() -> int:
+    """CPUs this process may run on (respects affinity and container cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+if NUMBA_AVAILABLE:
+    # Parallel kernels (prange over particles) use every CPU we are allowed,
+    # but never more threads than numba's pool was started with
+    numba.set_num_threads(min(usable_cpu_count(), numba.config.NUMBA_NUM_THREADS))
@@ -0,0 +1,14 @@
+from dataclasses import FrozenInstanceError, fields
+import pytest
+from app.config import EnvSettings, Settings, get_settings
+
+def test_settings_fields_match_env_settings():
+    """Every environment setting is carried over to the frozen settings."""
+    assert {f.name for f in fields(Settings)} == set(EnvSettings.model_fields)
+
+def test_settings_are_immutable():
+    """Loaded settings cannot be changed, including the CORS origins."""
+    settings = get_settings()
+    assert isinstance(settings.cors_origins, tuple)
+    with pytest.raises(FrozenInstanceError):
+        settings.debug = True
@@ -0,0 +1,148 @@
+import sys
+import threading
+import types
+from datetime import datetime
+import pytest
+import numpy as np
+import xarray as xr
+from app.services.copernicus import (
+    CopernicusClient,
+    NETCDF_ENGINE,
+    _cache_encoding,
+    _downcast,
+    _open_cached
+)
+
+def test_open_cached_reuses_loaded_dataset(tmp_path):
+    """Cached files are loaded once and served from memory afterwards."""
+    path = tmp_path / "currents.nc"
+    xr.Dataset({"uo": (("latitude", "longitude"), np.ones((2, 2)))}).to_netcdf(path, engine="h5netcdf")
+    
+    first = _open_cached(str(path))
+    second = _open_cached(str(path))
+    
+    assert first is second
+    assert float(first["uo"].mean()) == 1.0
+
+def test_cache_encoding_is_compressed(tmp_path):
+    """Cache files are written compressed and read back unchanged."""
+    ds = xr.Dataset({
+        "uo": (("time", "depth", "latitude", "longitude"), np.random.rand(8, 1, 12, 12))
+    })
+    encoding = _cache_encoding(ds)
+    assert encoding["uo"] == {"zlib": True, "complevel": 3}
+    
+    path = tmp_path / "wind.nc"
+    ds.to_netcdf(path, engine=NETCDF_ENGINE, encoding=encoding)
+    with xr.open_dataset(path, engine=NETCDF_ENGINE) as reopened:
+        np.testing.assert_allclose(reopened["uo"].values, ds["uo"].values)
+
+def test_tiles_covering():
+    """A bbox maps to the 1 degree tiles that contain it."""
+    tiles = CopernicusClient._tiles_covering(38.4, 39.2, -9.8, -8.9)
+    assert tiles == [(38, -10), (38, -9), (39, -10), (39, -9)]
+
+def test_currents_assembled_from_cached_tiles(tmp_path):
+    """Cached tiles are combined and clipped to the requested bbox."""
+    client = CopernicusClient()
+    client.cache_dir = tmp_path
+    start, end = datetime(2025, 12, 6, 12), datetime(2025, 12, 7, 12)
+    
+    for tile_lat, tile_lon in client._tiles_covering(38.4, 39.2, -9.8, -8.9):
+        lats = tile_lat + np.arange(4) * 0.25
+        lons = tile_lon + np.arange(4) * 0.25
+        tile = xr.Dataset(
+            {
+                "uo": (("latitude", "longitude"), np.full((4, 4), 0.1)),
+                "vo": (("latitude", "longitude"), np.full((4, 4), -0.2)),
+            },
+            coords={"latitude": lats, "longitude": lons}
+        )
+        path = client._get_tile_path("currents", tile_lat, tile_lon, start, end)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tile.to_netcdf(path, engine=NETCDF_ENGINE)
+    
+    data = client.get_currents_data(38.4, 39.2, -9.8, -8.9, start, end)
+    
+    assert float(data["latitude"].min()) >= 38.4
+    assert float(data["latitude"].max()) <= 39.2
+    assert float(data["longitude"].min()) >= -9.8
+    assert float(data["longitude"].max()) <= -8.9
+    np.testing.assert_allclose(data["latitude"], [38.5, 38.75, 39.0])
+    assert float(data["vo"].mean()) == pytest.approx(-0.2)
+
+def test_downcast_to_float32():
+    """Float variables are stored as float32 in the cache."""
+    ds = xr.Dataset({"uo": (("latitude",), np.array([0.1, 0.2]))})
+    ds["uo"].encoding = {"dtype": "float64"}
+    
+    small = _downcast(ds)
+    
+    assert small["uo"].dtype == np.float32
+    assert small["uo"].encoding == {}
+    assert ds["uo"].dtype == np.float64
+
+def test_forced_refresh_returns_new_download(tmp_path, monkeypatch):
+    """use_cache=False returns the fresh download, not the previously loaded tile."""
+    value = {"uo": 0.1}
+    
+    def open_dataset(minimum_latitude, minimum_longitude, **kwargs):
+        coords = {
+            "latitude": minimum_latitude + np.arange(4) * 0.25,
+            "longitude": minimum_longitude + np.arange(4) * 0.25
+        }
+        return xr.Dataset(
+            {
+                "uo": (("latitude", "longitude"), np.full((4, 4), value["uo"])),
+                "vo": (("latitude", "longitude"), np.zeros((4, 4))),
+            },
+            coords=coords
+        )
+    
+    monkeypatch.setitem(sys.modules, "copernicusmarine", types.SimpleNamespace(open_dataset=open_dataset))
+    client = CopernicusClient()
+    client.cache_dir = tmp_path
+    client._logged_in = True
+    start, end = datetime(2025, 12, 6, 12), datetime(2025, 12, 7, 12)
+    
+    first = client.get_currents_data(38.2, 38.8, -9.8, -9.2, start, end)
+    value["uo"] = 0.7
+    refreshed = client.get_currents_data(38.2, 38.8, -9.8, -9.2, start, end, use_cache=False)
+    cached = client.get_currents_data(38.2, 38.8, -9.8, -9.2, start, end)
+    
+    assert float(first["uo"].mean()) == pytest.approx(0.1)
+    assert float(refreshed["uo"].mean()) == pytest.approx(0.7)
+    assert float(cached["uo"].mean()) == pytest.approx(0.7)
+
+def test_missing_tiles_downloaded_concurrently(tmp_path, monkeypatch):
+    """Missing tiles are fetched in parallel and combined into one dataset."""
+    # Serial downloads would never get two callers through the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+    
+    def open_dataset(minimum_latitude, minimum_longitude, **kwargs):
+        calls.append((minimum_latitude, minimum_longitude))
+        barrier.wait()
+        coords = {
+            "latitude": minimum_latitude + np.arange(4) * 0.25,
+            "longitude": minimum_longitude + np.arange(4) * 0.25
+        }
+        return xr.Dataset(
+            {
+                "uo": (("latitude", "longitude"), np.full((4, 4), 0.3)),
+                "vo": (("latitude", "longitude"), np.zeros((4, 4))),
+            },
+            coords=coords
+        )
+    
+    monkeypatch.setitem(sys.modules, "copernicusmarine", types.SimpleNamespace(open_dataset=open_dataset))
+    client = CopernicusClient()
+    client.cache_dir = tmp_path
+    client._logged_in = True
+    start, end = datetime(2025, 12, 6, 12), datetime(2025, 12, 7, 12)
+    
+    data = client.get_currents_data(38.4, 39.2, -9.8, -8.9, start, end)
+    
+    assert sorted(calls) == [(38, -10), (38, -9), (39, -10), (39, -9)]
+    np.testing.assert_allclose(data["latitude"], [38.5, 38.75, 39.0])
+    assert float(data["uo"].mean()) == pytest.approx(0.3)
@@ -0,0 +1,16 @@
+def test_status(client):
+    response = client.get("/api/data/status")
+    assert response.status_code == 200
+    assert "configured" in response.json()
+
+def test_currents_rejects_invalid_bbox(client):
+    response = client.get("/api/data/currents", params={
+        "min_lat": 39.0, "max_lat": 38.0, "min_lon": -10.0, "max_lon": -9.0
+    })
+    assert response.status_code == 422
+
+def test_wind_rejects_out_of_range_bbox(client):
+    response = client.get("/api/data/wind", params={
+        "min_lat": 38.0, "max_lat": 39.0, "min_lon": -190.0, "max_lon": -9.0
+    })
+    assert response.status_code == 422
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+from app.models.drift import DriftRequest
+from app.routers import drift
+from app.services.monte_carlo import MonteCarloSimulator
+
+def test_calculate_drift_without_data(client):
+    """Drift calculation falls back to default environment data."""
+    response = client.post("/api/drift/calculate", json={
+        "lkp": {"lat": 38.0, "lon": -12.0},
+        "incident_time": "2025-12-06T12:00:00Z",
+        "projection_hours": 6,
+        "object_type": "life_raft",
+        "num_particles": 100
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["search_area"]["type"] == "Polygon"
+    ring = body["search_area"]["coordinates"][0]
+    assert all(len(vertex) == 2 for vertex in ring)
+    assert ring[0] == ring[-1]
+    assert body["estimated_drift_distance_km"] > 0
+    assert body["particles_summary"]["object_type"] == "life_raft"
+    assert len(body["particles"]["lats"]) == len(body["particles"]["lons"]) == 100
+
+def test_calculate_drift_stream(client):
+    """The streaming endpoint sends progressively larger partial results."""
+    with client.stream("POST", "/api/drift/calculate/stream", json={
+        "lkp": {"lat": 38.0, "lon": -12.0},
+        "incident_time": "2025-12-06T12:00:00Z",
+        "projection_hours": 6,
+        "object_type": "kayak",
+        "num_particles": 200
+    }) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.iter_lines()
+            if line.startswith("data: ")
+        ]
+    
+    completed = [e["particles_summary"]["completed_particles"] for e in events]
+    assert len(events) == 10
+    assert completed == sorted(completed)
+    assert completed[-1] == 200
+    assert events[-1]["search_area"]["type"] == "Polygon"
+
+def test_preview_drift(client):
+    """The preview returns a closed search-area ring for a reduced particle set."""
+    response = client.post("/api/drift/preview", json={
+        "lkp": {"lat": 38.0, "lon": -12.0},
+        "incident_time": "2025-12-06T12:00:00Z",
+        "projection_hours": 6,
+        "object_type": "life_raft",
+        "num_particles": 1000
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["preview"] is True
+    ring = body["search_area"]["coordinates"][0]
+    assert all(len(vertex) == 2 for vertex in ring)
+    assert ring[0] == ring[-1]
+    assert body["estimated_drift_km"] > 0
+
+def test_stream_stops_simulating_after_disconnect(monkeypatch):
+    """Closing the event stream stops the simulation after the batch in progress."""
+    batches = []
+    client_gone = threading.Event()
+    simulate = MonteCarloSimulator._simulate_particles
+    
+    def gated_simulate(self, *args):
+        batches.append(1)
+        if len(batches) == 2:
+            # Hold the second batch until the stream has been closed
+            client_gone.wait(timeout=5)
+        return simulate(self, *args)
+    
+    async def no_environment(request):
+        return None, None
+    
+    monkeypatch.setattr(MonteCarloSimulator, "_simulate_particles", gated_simulate)
+    monkeypatch.setattr(drift, "_load_environment", no_environment)
+    request = DriftRequest(
+        lkp={"lat": 38.0, "lon": -12.0},
+        incident_time="2025-12-06T12:00:00Z",
+        projection_hours=6,
+        object_type="kayak",
+        num_particles=200
+    )
+    
+    async def read_first_event():
+        response = await drift.calculate_drift_stream(request)
+        first = await response.body_iterator.__anext__()
+        # What Starlette does when the client disconnects
+        await response.body_iterator.aclose()
+        client_gone.set()
+        return first
+    
+    # asyncio.run joins the executor, so the producer has finished here
+    assert asyncio.run(read_first_event()).startswith(b"data: ")
+    assert len(batches) == 2
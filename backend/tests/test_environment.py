@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import xarray as xr
+from app.services.environment import GriddedField, step_times
+
+def sample(field, time, lats, lons):
+    """Sample a field at a single time the way the simulator does per step."""
+    t0, t1, wt = field.time_weights(step_times(time, 1, 1.0))
+    return field.sample_slices(t0[0], t1[0], wt[0], lats, lons)
+
+def make_dataset():
+    """Currents that vary linearly in time, latitude and longitude."""
+    times = pd.date_range("2025-12-06T12:00", periods=3, freq="6h")
+    lats = np.array([38.0, 38.5, 39.0])
+    lons = np.array([-10.0, -9.5, -9.0])
+    t, y, x = np.meshgrid(np.arange(3), lats, lons, indexing="ij")
+    return xr.Dataset(
+        {
+            "uo": (("time", "depth", "latitude", "longitude"), (y + x)[:, None]),
+            "vo": (("time", "depth", "latitude", "longitude"), t[:, None] * 1.0),
+        },
+        coords={"time": times, "depth": [0.5], "latitude": lats, "longitude": lons}
+    )
+
+def test_sample_bilinear_in_space_and_linear_in_time():
+    """Sampling reproduces a field that is linear in every dimension."""
+    field = GriddedField.from_dataset(make_dataset(), "uo", "vo")
+    u, v = sample(
+        field, datetime(2025, 12, 6, 21, tzinfo=timezone.utc),
+        np.array([38.25, 38.9]),
+        np.array([-9.75, -9.1])
+    )
+    np.testing.assert_allclose(u, [38.25 - 9.75, 38.9 - 9.1], rtol=1e-5)
+    np.testing.assert_allclose(v, [1.5, 1.5], rtol=1e-5)
+
+def test_sample_clamps_outside_grid():
+    """Positions and times outside the grid use the nearest edge values."""
+    field = GriddedField.from_dataset(make_dataset(), "uo", "vo")
+    u, v = sample(field, datetime(2026, 1, 1), np.array([45.0]), np.array([-20.0]))
+    np.testing.assert_allclose(u, [39.0 - 10.0])
+    np.testing.assert_allclose(v, [2.0])
+
+def test_time_weights_for_step_series():
+    """Per-step slices and weights are resolved for a whole projection at once."""
+    field = GriddedField.from_dataset(make_dataset(), "uo", "vo")
+    t0, t1, wt = field.time_weights(step_times(datetime(2025, 12, 6, 12), 4, 3.0))
+    np.testing.assert_array_equal(t0, [0, 0, 1, 1])
+    np.testing.assert_array_equal(t1, [1, 1, 2, 2])
+    np.testing.assert_allclose(wt, [0.0, 0.5, 0.0, 0.5])
+
+def test_step_samples_are_float32():
+    """Sampling with per-step weights keeps particle arrays float32."""
+    field = GriddedField.from_dataset(make_dataset(), "uo", "vo")
+    t0, t1, wt = field.time_weights(step_times(datetime(2025, 12, 6, 12), 3, 3.0))
+    u, v = field.sample_slices(
+        t0[1], t1[1], wt[1],
+        np.array([38.2], dtype=np.float32), np.array([-9.6], dtype=np.float32)
+    )
+    assert u.dtype == np.float32
+    assert v.dtype == np.float32
+
+def test_irregular_axis_uses_interpolated_index():
+    """Unevenly spaced axes still sample bilinearly."""
+    ds = make_dataset().assign_coords(latitude=[38.0, 38.25, 39.0])
+    field = GriddedField.from_dataset(ds, "uo", "vo")
+    assert field.lat_step is None
+    assert field.lon_step == 0.5
+    u, _ = sample(field, datetime(2025, 12, 6, 12), np.array([38.625]), np.array([-9.75]))
+    # Halfway between the second and third rows (values 38.5 and 39.0 plus lon)
+    np.testing.assert_allclose(u, [(38.5 + 39.0) / 2 - 9.75], rtol=1e-5)
@@ -0,0 +1,18 @@
+import pytest
+from app.utils.geo import create_bounding_box, haversine_distance
+
+def test_bounding_box_contains_radius():
+    """The bounding box extends radius_km in every direction."""
+    min_lat, max_lat, min_lon, max_lon = create_bounding_box(38.7223, -9.1393, 50)
+    assert min_lat < 38.7223 < max_lat
+    assert min_lon < -9.1393 < max_lon
+    assert haversine_distance(38.7223, -9.1393, max_lat, -9.1393) == pytest.approx(50, rel=0.01)
+    assert haversine_distance(38.7223, -9.1393, 38.7223, max_lon) == pytest.approx(50, rel=0.01)
+
+def test_bounding_box_is_cached():
+    """Nearby requests for the same LKP share one cached result."""
+    assert create_bounding_box(38.72231, -9.13929, 44.0) is create_bounding_box(38.7223, -9.1393, 44.0)
+
+def test_haversine_antipodal_points():
+    """Antipodal points are half the Earth's circumference apart, never NaN."""
+    assert haversine_distance(38.7223, -9.1393, -38.7223, 170.8607) == pytest.approx(6371 * 3.141592653589793)
@@ -0,0 +1,82 @@
+import math
+import pytest
+import numpy as np
+from app.services.leeway import (
+    calculate_leeway_velocity,
+    draw_leeway_noise,
+    meters_per_second_to_degrees_per_hour
+)
+from app.services import _mc_kernel
+from app.services.land_mask import LAND_MASK
+from app.models.drift import ObjectType
+from app.models.leeway_coefficients import (
+    LEEWAY_COEFFICIENTS,
+    LEEWAY_MEAN,
+    LEEWAY_TABLE,
+    OBJECT_TYPE_INDEX
+)
+
+# Open ocean west of Portugal, far from any land
+LAT, LON = 36.0, -15.0
+
+def run_step(object_type, env, noise, dt=1.0):
+    """Advance particles at (LAT, LON) by one step of the Numba kernel."""
+    n = len(env[0])
+    lats = np.full(n, LAT, dtype=np.float32)
+    lons = np.full(n, LON, dtype=np.float32)
+    out_lat, out_lon = np.empty_like(lats), np.empty_like(lons)
+    _mc_kernel.step(
+        lats, lons, *[np.asarray(x, dtype=np.float32) for x in env],
+        LEEWAY_TABLE[OBJECT_TYPE_INDEX[object_type]], *noise,
+        np.float32(dt), LAND_MASK, out_lat, out_lon, np.empty(n, dtype=bool)
+    )
+    return out_lat, out_lon
+
+def test_draw_noise_shapes():
+    """Noise is drawn per particle, with a leading step axis when requested."""
+    rng = np.random.default_rng(42)
+    noise_c, noise_w, div_dir, lee_pct = draw_leeway_noise(rng, 100)
+    assert noise_c.shape == noise_w.shape == (2, 100)
+    assert div_dir.shape == lee_pct.shape == (100,)
+    assert set(np.unique(div_dir)) <= {-1, 0, 1}
+    noise_c, _, div_dir, _ = draw_leeway_noise(rng, 100, num_steps=5)
+    assert noise_c.shape == (5, 2, 100)
+    assert div_dir.shape == (5, 100)
+
+def test_step_without_noise_matches_scalar():
+    """With no noise and no wind a particle moves with the current."""
+    n = 10
+    noise = draw_leeway_noise(np.random.default_rng(0), n, current_noise_std=0.0, wind_noise_std=0.0)
+    out_lat, out_lon = run_step(
+        ObjectType.KAYAK, (np.full(n, 0.3), np.full(n, 0.4), np.zeros(n), np.zeros(n)), noise, dt=2.0
+    )
+    vel_u, vel_v = calculate_leeway_velocity(0.3, 0.4, 0.0, 0.0, ObjectType.KAYAK)
+    dlon, dlat = meters_per_second_to_degrees_per_hour(vel_u, vel_v, LAT)
+    np.testing.assert_allclose(out_lat, LAT + dlat * 2.0, rtol=1e-6)
+    np.testing.assert_allclose(out_lon, LON + dlon * 2.0, rtol=1e-6)
+
+def test_step_mean_close_to_deterministic():
+    """Noisy steps are centred on the mean over divergence directions."""
+    n = 20000
+    noise = draw_leeway_noise(np.random.default_rng(1), n)
+    out_lat, out_lon = run_step(
+        ObjectType.FISHING_BOAT, (np.full(n, 0.1), np.zeros(n), np.full(n, 10.0), np.zeros(n)), noise
+    )
+    expected_u = np.mean([
+        calculate_leeway_velocity(0.1, 0.0, 10.0, 0.0, ObjectType.FISHING_BOAT, d)[0]
+        for d in (-1, 0, 1)
+    ])
+    expected_dlon, _ = meters_per_second_to_degrees_per_hour(expected_u, 0.0, LAT)
+    dlon_per_m_s, dlat_per_m_s = meters_per_second_to_degrees_per_hour(1.0, 1.0, LAT)
+    assert abs(np.mean(out_lon - LON) - expected_dlon) < 0.01 * dlon_per_m_s
+    assert abs(np.mean(out_lat - LAT)) < 0.01 * dlat_per_m_s
+
+def test_divergence_direction_scales_angle():
+    """Any integer direction scales the divergence angle, as the scalar API always has."""
+    ot = ObjectType.LIFE_RAFT
+    angle = math.radians(LEEWAY_COEFFICIENTS[ot].divergence_angle)
+    speed = 10.0 * LEEWAY_MEAN[ot]
+    for d in (-2, -1, 0, 1, 2):
+        u, v = calculate_leeway_velocity(0.0, 0.0, 10.0, 0.0, ot, divergence_direction=d)
+        assert u == pytest.approx(speed * math.cos(angle * d))
+        assert v == pytest.approx(speed * math.sin(angle * d))
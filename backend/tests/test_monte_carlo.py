@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from global_land_mask import globe
+from app.models.drift import ObjectType
+from app.services import _mc_kernel
+from app.services import monte_carlo
+from app.services.land_mask import LAND_MASK, is_land
+from app.services.leeway import draw_leeway_noise
+from app.services.monte_carlo import MonteCarloSimulator
+from app.utils.geo import haversine_distance
+
+def test_convex_hull_is_closed_ring():
+    """The hull ring is closed and skips interior points."""
+    simulator = MonteCarloSimulator()
+    polygon = simulator._create_convex_hull(
+        np.array([0.0, 0.0, 1.0, 1.0, 0.5]),
+        np.array([0.0, 1.0, 1.0, 0.0, 0.5])
+    )
+    ring = polygon["coordinates"][0]
+    assert ring.shape == (5, 2)
+    np.testing.assert_array_equal(ring[0], ring[-1])
+    assert not np.any(np.all(ring == 0.5, axis=1))
+
+def test_convex_hull_degenerate():
+    """Collinear or too few particles give an empty polygon."""
+    simulator = MonteCarloSimulator()
+    collinear = np.array([0.0, 1.0, 2.0])
+    assert simulator._create_convex_hull(collinear, collinear)["coordinates"] == [[]]
+    assert simulator._create_convex_hull(np.array([1.0]), np.array([1.0]))["coordinates"] == [[]]
+
+def test_density_polygon_excludes_outliers():
+    """The priority polygon is the hull of the particles closest to the centre."""
+    simulator = MonteCarloSimulator()
+    rng = np.random.default_rng(0)
+    lats = np.append(rng.normal(0.0, 0.01, 99), 1.0)
+    lons = np.append(rng.normal(0.0, 0.01, 99), 1.0)
+    ring = np.array(simulator._create_density_polygon(lats, lons, confidence=0.8)["coordinates"][0])
+    assert ring[:, 0].max() < 0.5
+    assert ring[:, 1].max() < 0.5
+
+def test_mean_drift_matches_haversine():
+    """Mean drift agrees with the scalar haversine helper."""
+    simulator = MonteCarloSimulator()
+    lats = np.array([38.8, 38.6, 39.7])
+    lons = np.array([-9.3, -9.5, -10.1])
+    expected = np.mean([haversine_distance(38.7, -9.4, la, lo) for la, lo in zip(lats, lons)])
+    assert abs(simulator._calculate_mean_drift(38.7, -9.4, lats, lons) - expected) < 1e-6
+
+def test_kernel_and_numpy_paths_agree(monkeypatch):
+    """With the same seed the Numba step and the NumPy step move particles alike."""
+    simulator = MonteCarloSimulator()
+    args = (36.0, -15.0, datetime(2025, 12, 6), 12, ObjectType.LIFE_RAFT, 100, 1.0)
+    kernel_lat, kernel_lon, _ = simulator._simulate_particles(*args, np.random.default_rng(11))
+    monkeypatch.setattr(monte_carlo, "NUMBA_AVAILABLE", False)
+    numpy_lat, numpy_lon, _ = simulator._simulate_particles(*args, np.random.default_rng(11))
+    np.testing.assert_allclose(kernel_lat, numpy_lat, rtol=1e-5)
+    np.testing.assert_allclose(kernel_lon, numpy_lon, rtol=1e-5)
+
+def test_blocked_numpy_step_matches_kernel():
+    """The blocked NumPy step gives the kernel's positions across block edges."""
+    n = 50
+    rng = np.random.default_rng(2)
+    lats = (38.0 + rng.random(n)).astype(np.float32)
+    lons = (-10.0 + rng.random(n)).astype(np.float32)
+    env = [rng.normal(0.0, 3.0, n).astype(np.float32) for _ in range(4)]
+    params = (np.float32(0.01), np.float32(0.04), np.float32(0.3))
+    noise = draw_leeway_noise(rng, n)
+    
+    kernel_lat, kernel_lon = np.empty_like(lats), np.empty_like(lons)
+    kernel_land = np.empty(n, dtype=bool)
+    _mc_kernel.step(
+        lats, lons, *env, params, *noise, np.float32(1.0), LAND_MASK,
+        kernel_lat, kernel_lon, kernel_land
+    )
+    numpy_lat, numpy_lon = np.empty_like(lats), np.empty_like(lons)
+    numpy_land = np.empty(n, dtype=bool)
+    _mc_kernel.step_numpy(
+        lats, lons, *env, params, *noise, np.float32(1.0), LAND_MASK,
+        numpy_lat, numpy_lon, numpy_land, _mc_kernel.make_work_buffers(16)
+    )
+    np.testing.assert_array_equal(kernel_land, numpy_land)
+    np.testing.assert_allclose(kernel_lat, numpy_lat, rtol=1e-5)
+    np.testing.assert_allclose(kernel_lon, numpy_lon, rtol=1e-5)
+
+def test_land_mask_matches_global_land_mask():
+    """The raster lookup agrees with global_land_mask around the Lisbon coast."""
+    rng = np.random.default_rng(4)
+    lats = rng.uniform(38.0, 39.5, 2000)
+    lons = rng.uniform(-10.0, -8.5, 2000)
+    np.testing.assert_array_equal(is_land(lats, lons), globe.is_land(lats, lons))
+
+def test_concurrent_simulations():
+    """Simulations on several threads at once all complete."""
+    def run(_):
+        return MonteCarloSimulator().run_simulation(
+            36.0, -15.0, datetime(2025, 12, 6), 12, ObjectType.LIFE_RAFT, num_particles=500
+        )
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(run, range(4)))
+    assert all(len(r.final_lats) == 500 for r in results)
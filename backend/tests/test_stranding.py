@@ -45,6 +45,5 @@ def test_particle_stranding():
     
     # Verify final positions are roughly at the coast (lon > -9.30)
     # Most should be around -9.2 to -9.15 (coastline)
-    lons = [p[1] for p in result.final_positions]
-    mean_lon = np.mean(lons)
+    mean_lon = np.mean(result.final_lons)
     assert mean_lon > start_lon # They moved East